@@ -0,0 +1,230 @@
+"""Integrity check and migration of the saved games in the archive.
+
+Every archive file is checked by a pool of worker processes:
+
+- the givens in `original` do not conflict,
+- a saved `solution` is complete, valid and agrees with the givens,
+- a saved `current` game keeps the givens,
+- no cell has more marks than `Cell.add_mark` allows.
+
+The result is written as a JSON report. With --fix, marks that are too
+long are truncated; with --migrate, files are rewritten in storage
+format version 2. Files with a level that cannot meet the version 2
+rules are reported as not migrated and left alone.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from .index import CFG_DIR
+from .index import LEVELS
+from .solver import format_puzzle
+from .solver import parse_puzzle
+from .solver import solve
+from .units import ConflictTracker
+
+MAX_MARKS = 4
+# version 2: the file has a "version" key, every level has a verified
+# "solution" and marks are limited to MAX_MARKS per cell
+FORMAT_VERSION = 2
+
+
+def parse_marks(marks: str) -> list[str]:
+    cells = [m for row in marks.split("/") for m in row.split("|")]
+    if len(cells) != 81 or not all(m.isdigit() or m == "" for m in cells):
+        raise ValueError(f"invalid marks string: {marks!r}")
+    return cells
+
+
+def format_marks(cells: list[str]) -> str:
+    return "/".join("|".join(cells[r * 9 : r * 9 + 9]) for r in range(9))
+
+
+def check_solution(
+    data: dict[str, Any],
+    original: list[int],
+    givens: list[int],
+) -> list[dict[str, Any]]:
+    """Check that a saved solution is complete, valid and keeps the givens."""
+    try:
+        solution = parse_puzzle(data["solution"])
+    except (TypeError, AttributeError, ValueError) as e:
+        return [{"check": "solution", "error": str(e)}]
+    wrong = sorted(ConflictTracker(solution).conflicts)
+    wrong += [i for i, num in enumerate(solution) if num == 0]
+    wrong += [i for i in givens if solution[i] != original[i]]
+    if wrong:
+        return [{"check": "solution", "cells": sorted(set(wrong))}]
+    return []
+
+
+def check_current(
+    data: dict[str, Any],
+    original: list[int],
+    givens: list[int],
+) -> list[dict[str, Any]]:
+    """Check that the saved current game keeps the givens."""
+    try:
+        current = parse_puzzle(data["current"])
+    except (TypeError, AttributeError, ValueError) as e:
+        return [{"check": "current", "error": str(e)}]
+    changed = [i for i in givens if current[i] != original[i]]
+    if changed:
+        return [{"check": "current", "cells": changed}]
+    return []
+
+
+def check_marks(data: dict[str, Any], fix: bool) -> list[dict[str, Any]]:
+    """Check the number of marks per cell, truncating them when asked."""
+    try:
+        marks = parse_marks(data["marks"])
+    except (TypeError, AttributeError, ValueError) as e:
+        return [{"check": "marks", "error": str(e)}]
+    long_marks = [i for i, m in enumerate(marks) if len(m) > MAX_MARKS]
+    if not long_marks:
+        return []
+    if fix:
+        # keep the marks add_mark would have accepted
+        data["marks"] = format_marks([m[:MAX_MARKS] for m in marks])
+    return [{"check": "marks", "cells": long_marks}]
+
+
+def check_level(data: dict[str, Any], fix: bool, migrate: bool) -> list[dict[str, Any]]:
+    """Check the puzzle data of one level, repairing it in place when asked.
+    Returns the problems found."""
+    issues: list[dict[str, Any]] = []
+    try:
+        original = parse_puzzle(data["original"])
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        return [{"check": "original", "error": str(e)}]
+    givens = [i for i, num in enumerate(original) if num]
+    conflicts = ConflictTracker(original).conflicts
+    if conflicts:
+        issues.append({"check": "givens", "cells": sorted(conflicts)})
+    if "solution" in data:
+        issues += check_solution(data, original, givens)
+    if "current" in data:
+        issues += check_current(data, original, givens)
+    if "marks" in data:
+        issues += check_marks(data, fix or migrate)
+
+    if migrate and not conflicts:
+        if "solution" not in data or any(i["check"] == "solution" for i in issues):
+            solved = solve(original)
+            if solved is not None:
+                data["solution"] = format_puzzle(solved)
+    return issues
+
+
+def meets_format(data: Any) -> bool:
+    """Check a level's puzzle data against the FORMAT_VERSION rules."""
+    if not isinstance(data, dict) or "solution" not in data:
+        return False
+    issues = check_level(data, fix=False, migrate=False)
+    return not any(i["check"] != "current" for i in issues)
+
+
+def check_file(
+    file_path: str,
+    fix: bool = False,
+    migrate: bool = False,
+) -> dict[str, Any]:
+    """Check (and repair) one archive file; runs in a worker process."""
+    result: dict[str, Any] = {"file": os.path.basename(file_path), "levels": {}}
+    try:
+        with open(file_path) as f:
+            game_data = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+
+    if not isinstance(game_data, dict):
+        result["error"] = f"expected a JSON object, got {type(game_data).__name__}"
+        return result
+
+    before = json.dumps(game_data)
+    not_migrated = []
+    for level in LEVELS:
+        if level in game_data:
+            try:
+                data = game_data[level]["puzzle"]
+                issues = check_level(data, fix, migrate)
+            except (KeyError, TypeError, AttributeError) as e:
+                data, issues = None, [{"check": "puzzle", "error": repr(e)}]
+            if issues:
+                result["levels"][level] = issues
+            if migrate and not meets_format(data):
+                not_migrated.append(level)
+
+    if not_migrated:
+        result["not_migrated"] = not_migrated
+    elif migrate:
+        game_data["version"] = FORMAT_VERSION
+    # only write repairs that changed the file, and never half-migrated files
+    if json.dumps(game_data) != before and (fix or migrate) and not not_migrated:
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(game_data, indent=1))
+        os.replace(tmp_path, file_path)
+        result["written"] = True
+    return result
+
+
+def check_archive(
+    cfg_dir: str = CFG_DIR,
+    fix: bool = False,
+    migrate: bool = False,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    paths = sorted(glob.glob(os.path.join(cfg_dir, "nytimes-*-sudoku.json")))
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(
+            pool.map(
+                check_file,
+                paths,
+                [fix] * len(paths),
+                [migrate] * len(paths),
+                chunksize=16,
+            ),
+        )
+    problems = [
+        r for r in results if r["levels"] or "error" in r or "not_migrated" in r
+    ]
+    return {
+        "files": len(results),
+        "files_with_problems": len(problems),
+        "files_written": sum(1 for r in results if r.get("written")),
+        "problems": problems,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the saved sudoku games")
+    parser.add_argument("--dir", type=str, default=CFG_DIR, help="Archive dir")
+    parser.add_argument("-o", "--report", type=str, help="Report file (stdout)")
+    parser.add_argument("--fix", action="store_true", help="Truncate long marks")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help=f"Rewrite files in storage format version {FORMAT_VERSION}",
+    )
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes")
+    args = parser.parse_args()
+
+    report = check_archive(args.dir, args.fix, args.migrate, args.workers)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(json.dumps(report, indent=1))
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import json
 import os
+from contextlib import closing
 from typing import Any
 
 import requests
 from bs4 import BeautifulSoup
 
+from .index import connect
+from .index import index_file
+
 URL = "https://www.nytimes.com/puzzles/sudoku/medium"
 CFG_DIR = "/home/jvh/.local/share/sudoku"
 
@@ -36,11 +40,12 @@ def format_puzzle(puzzle_list: list[int]) -> str:
     return puzzle_str[:-1]
 
 
-def write_puzzle_json(puzzle: dict[str, Any]) -> None:
+def write_puzzle_json(puzzle: dict[str, Any]) -> str:
     filename = "nytimes-" + puzzle["date"] + "-sudoku.json"
     file_path = os.path.join(CFG_DIR, filename)
     with open(file_path, "w") as f:
         f.write(json.dumps(puzzle, indent=1))
+    return file_path
 
 
 def main() -> None:
@@ -56,7 +61,10 @@ def main() -> None:
             puzzle[p]["puzzle"]["original"] = format_puzzle(
                 puzzle_data[p]["puzzle_data"]["puzzle"],
             )
-        write_puzzle_json(puzzle)
+        file_path = write_puzzle_json(puzzle)
+        # add the new puzzles to the searchable index
+        with closing(connect(CFG_DIR)) as db:
+            index_file(db, file_path)
     else:
         print("website 'www.nytimes.com' niet bereikbaar")
 
@@ -0,0 +1,262 @@
+"""Searchable index of the puzzles in the archive.
+
+For every puzzle the index stores the clue count, the givens pattern, its
+symmetries, the solver node count and a technique rating, in an sqlite
+database next to the puzzle files. The index is updated incrementally:
+only files that are new or changed since the last update are read, and
+the puzzles of deleted files are dropped.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+from collections.abc import Sequence
+from typing import Any
+
+from .solver import SolutionIterator
+from .solver import parse_puzzle
+from .units import CELL_UNITS
+from .units import UNITS
+
+CFG_DIR = "/home/jvh/.local/share/sudoku"
+INDEX_FILE = "sudoku-index.sqlite3"
+LEVELS = ["easy", "medium", "hard"]
+
+# technique rating: the hardest technique needed to solve the puzzle
+NAKED_SINGLES, HIDDEN_SINGLES, SEARCH = range(1, 4)
+RATINGS = {
+    NAKED_SINGLES: "naked singles",
+    HIDDEN_SINGLES: "hidden singles",
+    SEARCH: "search",
+}
+
+SYMMETRIES = {
+    "rotational": lambda r, c: (8 - r, 8 - c),
+    "quarter-turn": lambda r, c: (c, 8 - r),
+    "horizontal": lambda r, c: (8 - r, c),
+    "vertical": lambda r, c: (r, 8 - c),
+    "diagonal": lambda r, c: (c, r),
+    "antidiagonal": lambda r, c: (8 - c, 8 - r),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS puzzles (
+    date TEXT NOT NULL,
+    level TEXT NOT NULL,
+    file TEXT NOT NULL,
+    puzzle_id INTEGER,
+    clues INTEGER NOT NULL,
+    pattern TEXT NOT NULL,
+    symmetry TEXT NOT NULL,
+    nodes INTEGER NOT NULL,
+    rating INTEGER NOT NULL,
+    PRIMARY KEY (date, level)
+);
+CREATE INDEX IF NOT EXISTS puzzles_level_clues ON puzzles (level, clues);
+CREATE INDEX IF NOT EXISTS puzzles_rating ON puzzles (rating, nodes);
+"""
+
+
+def givens_pattern(values: Sequence[int]) -> str:
+    """81 characters, 1 for a given and 0 for an empty cell."""
+    return "".join("1" if v else "0" for v in values)
+
+
+def symmetries(pattern: str) -> list[str]:
+    found = []
+    for name, mirror in SYMMETRIES.items():
+        for index in range(81):
+            row, col = mirror(index // 9, index % 9)
+            if pattern[index] != pattern[row * 9 + col]:
+                break
+        else:
+            found.append(name)
+    return found
+
+
+def rate(values: Sequence[int]) -> int:
+    """Fill the grid with naked and hidden singles and return the hardest
+    technique used, or SEARCH if singles alone do not solve it."""
+    grid = list(values)
+    rating = NAKED_SINGLES
+    while 0 in grid:
+        masks = {}
+        for index, num in enumerate(grid):
+            if num == 0:
+                used = {grid[p] for u in CELL_UNITS[index] for p in UNITS[u]}
+                masks[index] = set(range(1, 10)) - used
+                if not masks[index]:
+                    return SEARCH  # contradiction
+        singles = [(i, m.pop()) for i, m in masks.items() if len(m) == 1]
+        if not singles:
+            for unit in UNITS:
+                for num in range(1, 10):
+                    places = [i for i in unit if i in masks and num in masks[i]]
+                    if len(places) == 1:
+                        singles.append((places[0], num))
+            if not singles:
+                return SEARCH
+            rating = HIDDEN_SINGLES
+        index, num = singles[0]
+        grid[index] = num
+    return rating
+
+
+def puzzle_record(data: str) -> dict[str, Any]:
+    values = parse_puzzle(data)
+    pattern = givens_pattern(values)
+    it = SolutionIterator(values)
+    it.next_solution()
+    return {
+        "clues": pattern.count("1"),
+        "pattern": pattern,
+        "symmetry": ",".join(symmetries(pattern)),
+        "nodes": it.nodes,
+        "rating": rate(values),
+    }
+
+
+def connect(cfg_dir: str = CFG_DIR) -> sqlite3.Connection:
+    db = sqlite3.connect(os.path.join(cfg_dir, INDEX_FILE))
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+
+def index_file(db: sqlite3.Connection, file_path: str) -> int:
+    """(Re)index all levels in one archive file. Returns the puzzle count."""
+    with open(file_path) as f:
+        game_data = json.loads(f.read())
+    name = os.path.basename(file_path)
+    count = 0
+    with db:
+        # levels removed from the file must not keep their old rows
+        db.execute("DELETE FROM puzzles WHERE file = ?", (name,))
+        for level in LEVELS:
+            if level not in game_data:
+                continue
+            record = puzzle_record(game_data[level]["puzzle"]["original"])
+            db.execute(
+                "INSERT OR REPLACE INTO puzzles VALUES "
+                "(:date, :level, :file, :puzzle_id, :clues, :pattern, :symmetry, "
+                ":nodes, :rating)",
+                {
+                    "date": game_data["date"],
+                    "level": level,
+                    "file": name,
+                    "puzzle_id": game_data[level].get("puzzle_id"),
+                    **record,
+                },
+            )
+            count += 1
+        db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?)",
+            (name, os.path.getmtime(file_path)),
+        )
+    return count
+
+
+def update_index(db: sqlite3.Connection, cfg_dir: str = CFG_DIR) -> int:
+    """Index the archive files that are new or changed since the last
+    update and drop the files that were deleted. Returns the number of
+    files read."""
+    known = {row["name"]: row["mtime"] for row in db.execute("SELECT * FROM files")}
+    paths = sorted(glob.glob(os.path.join(cfg_dir, "nytimes-*-sudoku.json")))
+    with db:
+        for name in known.keys() - {os.path.basename(p) for p in paths}:
+            db.execute("DELETE FROM puzzles WHERE file = ?", (name,))
+            db.execute("DELETE FROM files WHERE name = ?", (name,))
+    updated = 0
+    for file_path in paths:
+        if known.get(os.path.basename(file_path)) != os.path.getmtime(file_path):
+            index_file(db, file_path)
+            updated += 1
+    return updated
+
+
+def query(
+    db: sqlite3.Connection,
+    level: str | None = None,
+    min_clues: int | None = None,
+    max_clues: int | None = None,
+    symmetry: str | None = None,
+    pattern: str | None = None,
+    rating: int | None = None,
+    max_nodes: int | None = None,
+) -> list[sqlite3.Row]:
+    """Select puzzles from the index. `pattern` has 81 characters (slashes
+    are ignored): 1 for a given, 0 for an empty cell and . for either."""
+    where = []
+    params: list[Any] = []
+    if level is not None:
+        where.append("level = ?")
+        params.append(level)
+    if min_clues is not None:
+        where.append("clues >= ?")
+        params.append(min_clues)
+    if max_clues is not None:
+        where.append("clues <= ?")
+        params.append(max_clues)
+    if symmetry is not None:
+        where.append("instr(',' || symmetry || ',', ?) > 0")
+        params.append(f",{symmetry},")
+    if pattern is not None:
+        pattern = pattern.replace("/", "")
+        if len(pattern) != 81 or set(pattern) - set("01."):
+            raise ValueError(f"invalid pattern: {pattern!r}")
+        where.append("pattern LIKE ?")
+        params.append(pattern.replace(".", "_"))
+    if rating is not None:
+        where.append("rating = ?")
+        params.append(rating)
+    if max_nodes is not None:
+        where.append("nodes <= ?")
+        params.append(max_nodes)
+    sql = "SELECT * FROM puzzles"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return db.execute(sql + " ORDER BY date, level", params).fetchall()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sudoku archive index")
+    parser.add_argument("--dir", type=str, default=CFG_DIR, help="Archive dir")
+    parser.add_argument("-l", "--level", type=str, choices=LEVELS)
+    parser.add_argument("--min-clues", type=int)
+    parser.add_argument("--max-clues", type=int)
+    parser.add_argument("--symmetry", type=str, choices=list(SYMMETRIES))
+    parser.add_argument("--pattern", type=str, help="81 x 0/1/. (1 = given)")
+    parser.add_argument("--rating", type=int, choices=list(RATINGS))
+    parser.add_argument("--max-nodes", type=int)
+    args = parser.parse_args()
+
+    db = connect(args.dir)
+    updated = update_index(db, args.dir)
+    if updated:
+        print(f"indexed {updated} file(s)")
+    for row in query(
+        db,
+        args.level,
+        args.min_clues,
+        args.max_clues,
+        args.symmetry,
+        args.pattern,
+        args.rating,
+        args.max_nodes,
+    ):
+        print(
+            f"{row['date']} {row['level']:6} clues={row['clues']} "
+            f"rating={RATINGS[row['rating']]} nodes={row['nodes']} "
+            f"symmetry={row['symmetry'] or '-'}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Parallel search for a single hard puzzle.
+
+The top of the search tree is expanded breadth-first until there are many
+more open subproblems than workers. The subproblems are put on the
+process pool's shared queue, so a worker that finishes a small subtree
+picks up the next one while others are still busy with large ones.
+Workers search in node-budget slices and check a shared stop flag between
+slices: solving stops as soon as one worker finds a solution, counting
+stops when the optional limit is reached.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from typing import Any
+
+from .solver import SolutionIterator
+
+TASKS_PER_WORKER = 16
+STEP = 1000  # nodes searched between checks of the stop flag
+
+stop_event: Any = None
+solution_counter: Any = None
+solution_limit: int | None = None
+
+
+def split_subproblems(values: Sequence[int], min_tasks: int) -> list[list[int]]:
+    """Expand the search tree one level at a time, on the cell with the
+    fewest candidates, until there are at least `min_tasks` subproblems."""
+    frontier = [list(values)]
+    while len(frontier) < min_tasks:
+        expanded: list[list[int]] = []
+        split = False
+        for sub in frontier:
+            it = SolutionIterator(sub)
+            if it.exhausted:
+                continue
+            if not it.stack:
+                # already complete, nothing to split
+                expanded.append(sub)
+                continue
+            index, options = it.stack[0]
+            for num in reversed(options):
+                child = list(sub)
+                child[index] = num
+                expanded.append(child)
+                split = True
+        frontier = expanded
+        if not split:
+            break
+    return frontier
+
+
+def init_worker(event: Any, counter: Any, limit: int | None) -> None:
+    global stop_event, solution_counter, solution_limit
+    stop_event = event
+    solution_counter = counter
+    solution_limit = limit
+
+
+def search_subproblem(
+    values: list[int],
+    count: bool,
+    step: int,
+) -> tuple[list[int] | None, int, int]:
+    """Search one subtree; runs in a worker process.
+    Returns the first solution found, the number of solutions and the
+    number of visited nodes."""
+    it = SolutionIterator(values)
+    first: list[int] | None = None
+    found = 0
+    while not stop_event.is_set():
+        solution = it.next_solution(budget=step)
+        if solution is None:
+            if it.exhausted:
+                break
+            continue
+        found += 1
+        if first is None:
+            first = solution
+        if not count:
+            stop_event.set()
+            break
+        with solution_counter.get_lock():
+            solution_counter.value += 1
+            if solution_limit is not None and solution_counter.value >= solution_limit:
+                stop_event.set()
+    return first, found, it.nodes
+
+
+def parallel_search(
+    values: Sequence[int],
+    count: bool = False,
+    limit: int | None = None,
+    workers: int | None = None,
+    step: int = STEP,
+) -> tuple[list[int] | None, int, int]:
+    """Search the puzzle on a process pool.
+    Returns a solution (or None), the number of solutions found and the
+    total number of visited nodes. Without `count` the search stops at the
+    first solution."""
+    workers = workers or os.cpu_count() or 1
+    subproblems = split_subproblems(values, workers * TASKS_PER_WORKER)
+    ctx = multiprocessing.get_context()
+    event = ctx.Event()
+    counter = ctx.Value("i", 0)
+
+    solution: list[int] | None = None
+    found = 0
+    nodes = 0
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=ctx,
+        initializer=init_worker,
+        initargs=(event, counter, limit),
+    ) as pool:
+        futures = [
+            pool.submit(search_subproblem, sub, count, step) for sub in subproblems
+        ]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            sub_solution, sub_found, sub_nodes = future.result()
+            nodes += sub_nodes
+            found += sub_found
+            if solution is None:
+                solution = sub_solution
+            if event.is_set():
+                for other in futures:
+                    other.cancel()
+    if limit is not None:
+        found = min(found, limit)
+    return solution, found, nodes
+
+
+def parallel_solve(
+    values: Sequence[int],
+    workers: int | None = None,
+) -> list[int] | None:
+    """Return a solution of the puzzle or None."""
+    return parallel_search(values, workers=workers)[0]
+
+
+def parallel_count(
+    values: Sequence[int],
+    limit: int | None = None,
+    workers: int | None = None,
+) -> int:
+    """Count the solutions of the puzzle, stopping at `limit` if given."""
+    return parallel_search(values, count=True, limit=limit, workers=workers)[1]
@@ -0,0 +1,289 @@
+"""Render puzzles from the archive to image pages without opening a window.
+
+Each page holds a grid of puzzles. The grid lines are drawn once into a
+background surface and digits are rendered once per glyph; both are
+reused for every puzzle. Pages are rendered in parallel by a pool of
+worker processes, each with its own renderer.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from .solver import format_puzzle  # noqa: E402
+from .solver import parse_puzzle  # noqa: E402
+from .solver import solve  # noqa: E402
+from .sudoku import BG_COLOR  # noqa: E402
+from .sudoku import BG_IMMUTABLE  # noqa: E402
+from .sudoku import CFG_DIR  # noqa: E402
+from .sudoku import LINE_COLOR  # noqa: E402
+from .sudoku import VALUE_COLOR  # noqa: E402
+
+CELL = 40
+MARGIN = 40
+TITLE = 30
+SOLUTION_COLOR = (60, 90, 190)
+PAGE_COLOR = (255, 255, 255)
+FONT_NAME = "JetBrainsMono Nerd Font"
+
+
+class PuzzleSpec(NamedTuple):
+    title: str
+    original: str
+    current: str | None = None
+    solution: str | None = None
+    marks: str | None = None
+
+
+class PageRenderer:
+    """Draw puzzles on offscreen surfaces, caching the grid and glyphs."""
+
+    def __init__(self, cell: int = CELL) -> None:
+        pygame.font.init()
+        self.cell = cell
+        self.font = pygame.font.SysFont(FONT_NAME, cell * 3 // 5)
+        self.font_marks = pygame.font.SysFont(FONT_NAME, cell // 3)
+        self.font_title = pygame.font.SysFont(FONT_NAME, TITLE * 2 // 3)
+        self.glyphs: dict[tuple[str, int, tuple[int, int, int]], pygame.Surface] = {}
+        self.background = self.make_background()
+
+    def glyph(
+        self,
+        num: int,
+        color: tuple[int, int, int] = VALUE_COLOR,
+        small: bool = False,
+    ) -> pygame.Surface:
+        key = ("mark" if small else "value", num, color)
+        if key not in self.glyphs:
+            font = self.font_marks if small else self.font
+            self.glyphs[key] = font.render(str(num), True, color)
+        return self.glyphs[key]
+
+    def make_background(self) -> pygame.Surface:
+        """Empty puzzle: 10 horizontal and 10 vertical lines."""
+        size = 9 * self.cell + 1
+        surface = pygame.Surface((size, size))
+        surface.fill(BG_COLOR)
+        for i in range(0, 10):
+            width = 3 if i % 3 == 0 else 1
+            xy = min(i * self.cell, size - width)
+            pygame.draw.line(surface, LINE_COLOR, (xy, 0), (xy, size), width)
+            pygame.draw.line(surface, LINE_COLOR, (0, xy), (size, xy), width)
+        return surface
+
+    def blit_centered(
+        self,
+        surface: pygame.Surface,
+        glyph: pygame.Surface,
+        x: int,
+        y: int,
+    ) -> None:
+        surface.blit(
+            glyph,
+            (
+                x + (self.cell - glyph.get_width()) // 2,
+                y + (self.cell - glyph.get_height()) // 2,
+            ),
+        )
+
+    def render_puzzle(self, puzzle: PuzzleSpec) -> pygame.Surface:
+        surface = self.background.copy()
+        original = parse_puzzle(puzzle.original)
+        current = parse_puzzle(puzzle.current) if puzzle.current else original
+        solution = parse_puzzle(puzzle.solution) if puzzle.solution else None
+        marks = [""] * 81
+        if puzzle.marks:
+            marks = [m for row in puzzle.marks.split("/") for m in row.split("|")]
+
+        for index in range(81):
+            x, y = (index % 9) * self.cell, (index // 9) * self.cell
+            if original[index] != 0:
+                # keep the grid lines visible around the shaded cell
+                surface.fill(BG_IMMUTABLE, (x + 2, y + 2, self.cell - 3, self.cell - 3))
+                self.blit_centered(surface, self.glyph(original[index]), x, y)
+            elif current[index] != 0:
+                self.blit_centered(surface, self.glyph(current[index]), x, y)
+            else:
+                # solution digits fill the empty cells, marks stay in the corners
+                if solution is not None:
+                    glyph = self.glyph(solution[index], SOLUTION_COLOR)
+                    self.blit_centered(surface, glyph, x, y)
+                corners = [
+                    (x + 4, y + 2),
+                    (x + self.cell * 3 // 4, y + 2),
+                    (x + self.cell * 3 // 4, y + self.cell * 2 // 3),
+                    (x + 4, y + self.cell * 2 // 3),
+                ]
+                for mark, xy in zip(marks[index], corners):
+                    surface.blit(self.glyph(int(mark), small=True), xy)
+        return surface
+
+    def render_page(
+        self,
+        puzzles: list[PuzzleSpec],
+        columns: int,
+        rows: int,
+    ) -> pygame.Surface:
+        size = 9 * self.cell + 1
+        page = pygame.Surface(
+            (
+                columns * size + (columns + 1) * MARGIN,
+                rows * (size + TITLE) + (rows + 1) * MARGIN,
+            ),
+        )
+        page.fill(PAGE_COLOR)
+        for i, puzzle in enumerate(puzzles):
+            x = MARGIN + (i % columns) * (size + MARGIN)
+            y = MARGIN + (i // columns) * (size + TITLE + MARGIN)
+            page.blit(self.font_title.render(puzzle.title, True, VALUE_COLOR), (x, y))
+            page.blit(self.render_puzzle(puzzle), (x, y + TITLE))
+        return page
+
+
+renderer: PageRenderer | None = None
+
+
+def init_worker(cell: int) -> None:
+    global renderer
+    renderer = PageRenderer(cell)
+
+
+def render_page_file(
+    puzzles: list[PuzzleSpec],
+    file_path: str,
+    columns: int,
+    rows: int,
+) -> str:
+    """Render one page and save it; runs in a worker process set up by
+    init_worker."""
+    if renderer is None:
+        raise RuntimeError("render_page_file needs a worker started by init_worker")
+    pygame.image.save(renderer.render_page(puzzles, columns, rows), file_path)
+    return file_path
+
+
+def load_puzzles(
+    paths: list[str],
+    levels: list[str],
+    solutions: bool,
+    marks: bool,
+) -> list[PuzzleSpec]:
+    puzzles = []
+    for file_path in paths:
+        with open(file_path) as f:
+            game_data = json.loads(f.read())
+        for level in levels:
+            if level not in game_data:
+                continue
+            data = game_data[level]["puzzle"]
+            solution = None
+            if solutions:
+                solution = data.get("solution")
+                if solution is None:
+                    solved = solve(parse_puzzle(data["original"]))
+                    solution = format_puzzle(solved) if solved else None
+            puzzles.append(
+                PuzzleSpec(
+                    title=f"{game_data['date']} {level}",
+                    original=data["original"],
+                    current=data.get("current") if marks else None,
+                    solution=solution,
+                    marks=data.get("marks") if marks else None,
+                ),
+            )
+    return puzzles
+
+
+def render_pages(
+    puzzles: list[PuzzleSpec],
+    out_dir: str,
+    columns: int = 2,
+    rows: int = 3,
+    cell: int = CELL,
+    workers: int | None = None,
+    extension: str = "png",
+) -> list[str]:
+    """Split the puzzles over pages and render them in parallel."""
+    os.makedirs(out_dir, exist_ok=True)
+    per_page = columns * rows
+    pages = [puzzles[i : i + per_page] for i in range(0, len(puzzles), per_page)]
+    paths = [
+        os.path.join(out_dir, f"sudoku-page-{n:04d}.{extension}")
+        for n in range(1, len(pages) + 1)
+    ]
+    with ProcessPoolExecutor(
+        workers,
+        initializer=init_worker,
+        initargs=(cell,),
+    ) as pool:
+        return list(
+            pool.map(
+                render_page_file,
+                pages,
+                paths,
+                [columns] * len(pages),
+                [rows] * len(pages),
+            ),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render sudoku puzzles to pages")
+    parser.add_argument("dates", type=str, nargs="*", help="Sudoku dates (all)")
+    parser.add_argument(
+        "-l",
+        "--level",
+        type=str,
+        choices=["easy", "medium", "hard"],
+        action="append",
+        help="Sudoku level (all)",
+    )
+    parser.add_argument("-o", "--out", type=str, default=".", help="Output dir")
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cell", type=int, default=CELL, help="Cell size (px)")
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["png", "jpg", "bmp", "tga"],
+        default="png",
+    )
+    parser.add_argument("-s", "--solutions", action="store_true")
+    parser.add_argument("-m", "--marks", action="store_true", help="Saved game")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes")
+    args = parser.parse_args()
+
+    if args.dates:
+        paths = [
+            os.path.join(CFG_DIR, f"nytimes-{date}-sudoku.json") for date in args.dates
+        ]
+    else:
+        paths = sorted(glob.glob(os.path.join(CFG_DIR, "nytimes-*-sudoku.json")))
+    puzzles = load_puzzles(
+        paths,
+        args.level or ["easy", "medium", "hard"],
+        args.solutions,
+        args.marks,
+    )
+    for file_path in render_pages(
+        puzzles,
+        args.out,
+        args.columns,
+        args.rows,
+        args.cell,
+        args.workers,
+        args.format,
+    ):
+        print(file_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Local solver service.
+
+Clients connect to a unix socket (or a tcp port) and send puzzles in the
+slash-separated format, one per line. Every line is answered, in order,
+with one line of JSON. Requests from all connections are grouped into
+micro-batches and solved by a pool of worker processes that is started
+once, so clients do not pay for interpreter and import startup.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import stat
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from .solver import SolutionIterator
+from .solver import format_puzzle
+from .solver import parse_puzzle
+
+SOCKET_PATH = "/tmp/sudoku-solver.sock"
+BATCH_SIZE = 32
+BATCH_WINDOW = 0.005  # seconds to wait for a batch to fill up
+SOLUTION_LIMIT = 2  # enough to tell unique puzzles from the others
+NODE_BUDGET = 1_000_000  # per puzzle, so one request cannot stall a batch
+
+
+def solve_puzzle(data: str, budget: int = NODE_BUDGET) -> dict[str, Any]:
+    """Solve and count (up to SOLUTION_LIMIT) within `budget` nodes.
+    Without a solution in budget the result is an error; when the budget
+    runs out while counting, `solutions` is a lower bound and
+    `budget_exceeded` is set."""
+    start = time.perf_counter()
+    it = SolutionIterator(parse_puzzle(data))
+    solution = it.next_solution(budget)
+    if solution is None and not it.exhausted:
+        return {
+            "puzzle": data,
+            "error": "node budget exceeded",
+            "nodes": it.nodes,
+            "time": time.perf_counter() - start,
+        }
+    result: dict[str, Any] = {
+        "puzzle": data,
+        "solution": None if solution is None else format_puzzle(solution),
+        "solutions": 0 if solution is None else 1,
+    }
+    while 0 < result["solutions"] < SOLUTION_LIMIT:
+        if it.nodes >= budget:
+            result["budget_exceeded"] = True
+            break
+        if it.next_solution(budget - it.nodes) is None:
+            if not it.exhausted:
+                result["budget_exceeded"] = True
+            break
+        result["solutions"] += 1
+    result["nodes"] = it.nodes
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+def solve_batch(
+    puzzles: list[str],
+    budget: int = NODE_BUDGET,
+) -> list[dict[str, Any]]:
+    """Solve a batch of puzzles; runs in a worker process."""
+    results = []
+    for data in puzzles:
+        try:
+            results.append(solve_puzzle(data, budget))
+        except ValueError as e:
+            results.append({"puzzle": data, "error": str(e)})
+    return results
+
+
+class SolverService:
+    def __init__(
+        self,
+        workers: int | None = None,
+        batch_size: int = BATCH_SIZE,
+        batch_window: float = BATCH_WINDOW,
+        budget: int = NODE_BUDGET,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.queue: asyncio.Queue[tuple[str, asyncio.Future[dict[str, Any]]]]
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        """Create the request queue and start the worker processes."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.pool, solve_batch, [])
+                for _ in range(self.workers)
+            ),
+        )
+        self.spawn(self.batcher())
+
+    def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    def spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def submit(self, puzzle: str) -> dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((puzzle, future))
+        return await future
+
+    async def batcher(self) -> None:
+        """Collect queued requests until the batch is full or the batch
+        window has passed, then hand the batch to the pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except TimeoutError:
+                    break
+            self.spawn(self.dispatch(batch))
+
+    async def dispatch(
+        self,
+        batch: list[tuple[str, asyncio.Future[dict[str, Any]]]],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        puzzles = [puzzle for puzzle, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self.pool,
+                solve_batch,
+                puzzles,
+                self.budget,
+            )
+        except Exception as e:
+            results = [{"puzzle": puzzle, "error": repr(e)} for puzzle in puzzles]
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Read puzzles until EOF. Requests of one connection are solved
+        concurrently; the answers are written in request order."""
+        pending: asyncio.Queue[asyncio.Future[dict[str, Any]] | None]
+        pending = asyncio.Queue()
+        sender = asyncio.create_task(self.send_results(pending, writer))
+        try:
+            while line := await reader.readline():
+                puzzle = line.decode(errors="replace").strip()
+                if puzzle:
+                    await pending.put(asyncio.create_task(self.submit(puzzle)))
+        except ValueError as e:
+            # a line over the stream limit; the rest of the stream is lost
+            error = asyncio.get_running_loop().create_future()
+            error.set_result({"error": str(e)})
+            await pending.put(error)
+        except ConnectionError:
+            pass
+        finally:
+            pending.put_nowait(None)
+            try:
+                await sender
+            except ConnectionError:
+                # the client went away, its remaining answers are dropped
+                pass
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def send_results(
+        self,
+        pending: asyncio.Queue[asyncio.Future[dict[str, Any]] | None],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        while (future := await pending.get()) is not None:
+            writer.write((json.dumps(await future) + "\n").encode())
+            await writer.drain()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    if args.port is None and os.path.lexists(args.socket):
+        # only replace a stale socket, never another kind of file
+        if not stat.S_ISSOCK(os.lstat(args.socket).st_mode):
+            raise SystemExit(f"{args.socket} exists and is not a socket")
+        os.remove(args.socket)
+    service = SolverService(
+        args.workers,
+        args.batch_size,
+        args.batch_window,
+        args.budget,
+    )
+    await service.start()
+    if args.port is not None:
+        server = await asyncio.start_server(service.handle_client, args.host, args.port)
+        print(f"sudoku solver listening on {args.host}:{args.port}")
+    else:
+        server = await asyncio.start_unix_server(service.handle_client, args.socket)
+        print(f"sudoku solver listening on {args.socket}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local sudoku solver service")
+    parser.add_argument("--socket", type=str, default=SOCKET_PATH, help="Unix socket")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="TCP host")
+    parser.add_argument("--port", type=int, help="TCP port (instead of socket)")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=NODE_BUDGET,
+        help="Max solver nodes per puzzle",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Headless sudoku solver.
+
+The search works on a flat list of 81 values (row-major, 0 is empty) and
+does not depend on pygame, so it can be used from scripts and worker
+processes without opening a window.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+
+from .units import box_index
+
+ALL_DIGITS = 0x3FE  # bit n set for digit n, n in 1..9
+
+
+def parse_puzzle(data: str) -> list[int]:
+    """Convert the slash-separated puzzle format to a flat list of 81 values."""
+    rows = data.strip().split("/")
+    if len(rows) != 9 or any(len(r) != 9 or not r.isdigit() for r in rows):
+        raise ValueError(f"invalid puzzle string: {data!r}")
+    return [int(s) for row in rows for s in row]
+
+
+def format_puzzle(values: Sequence[int]) -> str:
+    """Convert a flat list of 81 values to the slash-separated puzzle format."""
+    return "/".join(
+        "".join(str(v) for v in values[r * 9 : r * 9 + 9]) for r in range(9)
+    )
+
+
+class SolutionIterator:
+    """Lazily enumerate the solutions of a puzzle.
+
+    The search is a depth-first search on an explicit stack, so it can be
+    paused and resumed: `next_solution` takes an optional node budget and
+    returns None when the budget runs out before a solution is found.
+    Calling it again continues where the previous call stopped."""
+
+    def __init__(self, values: Sequence[int]) -> None:
+        self.values: list[int] = list(values)
+        self.rows: list[int] = [0] * 9
+        self.cols: list[int] = [0] * 9
+        self.boxes: list[int] = [0] * 9
+        self.nodes: int = 0
+        self.stack: list[tuple[int, list[int]]] = []
+        self.exhausted: bool = False
+        self.solved_on_start: bool = False
+
+        for index, num in enumerate(self.values):
+            if num == 0:
+                continue
+            bit = 1 << num
+            row, col, box = index // 9, index % 9, box_index(index)
+            if (self.rows[row] | self.cols[col] | self.boxes[box]) & bit:
+                # givens conflict with each other: no solutions
+                self.exhausted = True
+                return
+            self.rows[row] |= bit
+            self.cols[col] |= bit
+            self.boxes[box] |= bit
+
+        frame = self.select_cell()
+        if frame is None:
+            self.solved_on_start = True
+        else:
+            self.stack.append(frame)
+
+    def __iter__(self) -> Iterator[list[int]]:
+        return self
+
+    def __next__(self) -> list[int]:
+        solution = self.next_solution()
+        if solution is None:
+            raise StopIteration
+        return solution
+
+    def candidates(self, index: int) -> int:
+        used = (
+            self.rows[index // 9] | self.cols[index % 9] | self.boxes[box_index(index)]
+        )
+        return ALL_DIGITS & ~used
+
+    def select_cell(self) -> tuple[int, list[int]] | None:
+        """Return the empty cell with the fewest candidates and those
+        candidates (in pop order), or None if the grid is full."""
+        best: int = -1
+        best_mask: int = 0
+        best_count: int = 10
+        for index, num in enumerate(self.values):
+            if num != 0:
+                continue
+            mask = self.candidates(index)
+            count = mask.bit_count()
+            if count < best_count:
+                best, best_mask, best_count = index, mask, count
+                if count <= 1:
+                    break
+        if best == -1:
+            return None
+        return best, [n for n in range(9, 0, -1) if best_mask & (1 << n)]
+
+    def place(self, index: int, num: int) -> None:
+        bit = 1 << num
+        self.values[index] = num
+        self.rows[index // 9] |= bit
+        self.cols[index % 9] |= bit
+        self.boxes[box_index(index)] |= bit
+
+    def remove(self, index: int) -> None:
+        bit = ~(1 << self.values[index])
+        self.values[index] = 0
+        self.rows[index // 9] &= bit
+        self.cols[index % 9] &= bit
+        self.boxes[box_index(index)] &= bit
+
+    def next_solution(self, budget: int | None = None) -> list[int] | None:
+        """Continue the search until the next solution is found.
+
+        Returns a copy of the solved values, or None when the search is
+        exhausted (see `exhausted`) or when `budget` nodes were visited
+        in this call without finding a solution."""
+        if budget is not None and budget < 1:
+            raise ValueError(f"budget must be at least 1, got {budget}")
+        if self.solved_on_start:
+            self.solved_on_start = False
+            self.exhausted = True
+            return list(self.values)
+
+        spent = 0
+        while self.stack:
+            index, options = self.stack[-1]
+            if self.values[index] != 0:
+                # undo the previous attempt for this cell
+                self.remove(index)
+            if not options:
+                self.stack.pop()
+                continue
+            if budget is not None and spent >= budget:
+                return None
+            spent += 1
+            self.nodes += 1
+            self.place(index, options.pop())
+            frame = self.select_cell()
+            if frame is None:
+                return list(self.values)
+            if frame[1]:
+                self.stack.append(frame)
+
+        self.exhausted = True
+        return None
+
+
+def solutions(values: Sequence[int]) -> SolutionIterator:
+    """Return a lazy iterator over all solutions of the puzzle."""
+    return SolutionIterator(values)
+
+
+def solve(values: Sequence[int]) -> list[int] | None:
+    """Return the first solution of the puzzle or None."""
+    return next(SolutionIterator(values), None)
+
+
+def count_solutions(values: Sequence[int], limit: int | None = None) -> int:
+    """Count the solutions of the puzzle, stopping at `limit` if given."""
+    count = 0
+    for _ in SolutionIterator(values):
+        count += 1
+        if limit is not None and count >= limit:
+            break
+    return count
+
+
+class BackgroundSolver(threading.Thread):
+    """Solve a puzzle in a worker thread.
+
+    The search runs in slices of `step` nodes. Between slices the progress
+    callback gets the number of visited nodes and the cancel flag is checked.
+    `on_done` is called from the worker thread with the solution, or None
+    if the puzzle has no solution; it is not called after `cancel()`."""
+
+    def __init__(
+        self,
+        values: Sequence[int],
+        on_done: Callable[[list[int] | None], None],
+        on_progress: Callable[[int], None] | None = None,
+        step: int = 2000,
+    ) -> None:
+        if step < 1:
+            raise ValueError(f"step must be at least 1, got {step}")
+        super().__init__(daemon=True)
+        self.values = list(values)
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.step = step
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def run(self) -> None:
+        it = SolutionIterator(self.values)
+        while not self.cancelled.is_set():
+            solution = it.next_solution(budget=self.step)
+            if solution is not None or it.exhausted:
+                self.on_done(solution)
+                return
+            if self.on_progress is not None:
+                self.on_progress(it.nodes)
+            time.sleep(0)  # let the ui thread have the GIL
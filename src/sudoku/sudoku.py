@@ -14,6 +14,9 @@ from typing import Any
 
 import pygame
 
+from .solver import BackgroundSolver
+from .units import ConflictTracker
+from .units import cell_index
 # from pygame.display import flip
 
 pygame.init()
@@ -61,6 +64,9 @@ VALID_NAV_EVENTS = [
     pygame.K_RIGHT,
 ]
 
+SOLVER_PROGRESS_EVENT = pygame.event.custom_type()
+SOLVER_DONE_EVENT = pygame.event.custom_type()
+
 
 class Mode(Enum):
     STARTING, PLAYING, SOLVED = range(3)
@@ -155,9 +161,13 @@ class SudokuGrid:
         self.level: str
         self.game_data: dict[str, Any]
         self.grid: list[list[Cell]] = []
+        self.solution_pending: bool = False
+        self.solution_failed: bool = False
+        self.tracker: ConflictTracker
         self.init_grid()
         self.setup_game_data()
         self.setup_game()
+        self.reset_tracker()
 
     def find_options(self, row: int, col: int, mode: Mode = Mode.PLAYING) -> list[int]:
         """Row and Col are sudoku-coordinates."""
@@ -178,7 +188,36 @@ class SudokuGrid:
             for col in range(1, 10):
                 self.grid[row][col].set_to_original()
                 self.grid[row][col].set_focus(Focus.NONE)
-                self.grid[row][col].invalid = False
+        self.reset_tracker()
+
+    def reset_tracker(self) -> None:
+        """Rebuild the conflict tracker from the "current" values."""
+        self.tracker = ConflictTracker(self.values_to_list(Mode.PLAYING))
+        for index in range(81):
+            cell = self.grid[index // 9 + 1][index % 9 + 1]
+            cell.set_invalid(index in self.tracker.conflicts)
+
+    def set_value(self, row: int, col: int, num: int) -> list[Cell]:
+        """Set the "current" value of a cell and update the conflict flags.
+        Returns the cell and the peers whose flag changed, to be redrawn."""
+        cell = self.grid[row][col]
+        cell.set_val(num)
+        changed = self.tracker.set_value(cell_index(row, col), num)
+        cell.set_invalid(cell_index(row, col) in self.tracker.conflicts)
+        cells = [cell]
+        for index in changed:
+            peer = self.grid[index // 9 + 1][index % 9 + 1]
+            peer.set_invalid(index in self.tracker.conflicts)
+            if peer is not cell:
+                cells.append(peer)
+        return cells
+
+    def update_invalid(self, row: int, col: int) -> None:
+        """The conflict tracker owns the invalid flag; copy it to the cell."""
+        self.grid[row][col].set_invalid(cell_index(row, col) in self.tracker.conflicts)
+
+    def is_solved(self) -> bool:
+        return self.tracker.is_solved()
 
     def get_cell(self, row: int, col: int) -> Cell:
         return self.grid[row][col]
@@ -188,38 +227,21 @@ class SudokuGrid:
         # is num in range of 1..9
         if not 0 < num < 10:
             return False
+        if mode == Mode.PLAYING:
+            return self.tracker.allows(cell_index(row, col), num)
         return num in self.find_options(row, col, mode)
 
-    def solve_sudoku(self) -> bool:
-        """doc"""
-        # step 1: pre-fill solution with hidden singles
-        for row in range(1, 10):
-            for col in range(1, 10):
-                if self.grid[row][col].is_mutable():
-                    options = self.find_options(row, col, Mode.SOLVED)
-                    if len(options) == 1:
-                        self.grid[row][col].set_val(options[0], Mode.SOLVED)
-
-        # step 2: use backtracking to fill remaining empty cells
-        if self.solver():
-            print("Puzzle is solved !!!!")
-            self.print(Mode.SOLVED)
-            return True
-        else:
+    def apply_solution(self, solution: list[int] | None) -> bool:
+        """Store the result of a background solve as the `solved` values.
+        Without a solution the puzzle stays unsolved for good."""
+        if solution is None:
+            self.solution_failed = True
             print("Puzzle could not be solved !!!!")
             return False
-
-    def solver(self) -> int | None:
-        for row in range(1, 10):
-            for col in range(1, 10):
-                if self.grid[row][col].get_val(Mode.SOLVED) == 0:
-                    options = self.find_options(row, col, Mode.SOLVED)
-                    for num in options:
-                        self.grid[row][col].set_val(num, Mode.SOLVED)
-                        if self.solver():
-                            return True
-                        self.grid[row][col].set_val(0, Mode.SOLVED)
-                    return False
+        self.load_grid_list(solution, Mode.SOLVED)
+        self.solution_pending = False
+        print("Puzzle is solved !!!!")
+        self.print(Mode.SOLVED)
         return True
 
     def find_probability(self, toggle: bool) -> None:
@@ -238,10 +260,17 @@ class SudokuGrid:
                 else:
                     self.grid[row][col].probability = ""
 
-    def validate(self) -> None:
+    def validate(self) -> bool:
+        """Mark cells that differ from the solution. A solved puzzle has
+        no errors, so flags left by an earlier validate are cleared."""
+        solved = self.is_solved()
         for row in range(1, 10):
             for col in range(1, 10):
-                self.grid[row][col].validate()
+                if solved:
+                    self.grid[row][col].set_error(False)
+                else:
+                    self.grid[row][col].validate()
+        return solved
 
     def setup_game_data(self) -> None:
         if len(sys.argv) == 1:
@@ -294,6 +323,10 @@ class SudokuGrid:
             for col, val in enumerate([int(s) for s in list(data)]):
                 self.grid[row + 1][col + 1].set_val(val, mode)
 
+    def load_grid_list(self, values: list[int], mode: Mode) -> None:
+        for index, val in enumerate(values):
+            self.grid[index // 9 + 1][index % 9 + 1].set_val(val, mode)
+
     def load_grid_marks(self, marks: str) -> None:
         for row, marks in enumerate(marks.split("/")):
             for col, mark in enumerate(marks.split("|")):
@@ -306,15 +339,17 @@ class SudokuGrid:
         self.load_grid_data(data["original"], Mode.PLAYING)
         self.load_grid_data(data["original"], Mode.SOLVED)
 
+        if "current" in data:
+            # load saved current game & markings
+            self.load_grid_data(data["current"], Mode.PLAYING)
+            self.load_grid_marks(data["marks"])
+
         if "solution" not in data:
-            # this is a new game and needs to be solved
-            if not self.solve_sudoku():
-                sys.exit()
+            # this is a new game and needs to be solved, which is done in
+            # the background by the board
+            self.solution_pending = True
         else:
-            # load saved solution & current game & markings
-            self.load_grid_data(data["current"], Mode.PLAYING)
             self.load_grid_data(data["solution"], Mode.SOLVED)
-            self.load_grid_marks(data["marks"])
         print(f"init sudoku: {self.game_path}\n")
 
     def values_to_string(self, mode: Mode) -> str:
@@ -325,6 +360,11 @@ class SudokuGrid:
             grid_str += "/"
         return grid_str[:-1]
 
+    def values_to_list(self, mode: Mode) -> list[int]:
+        return [
+            self.grid[r][c].value[mode] for r in range(1, 10) for c in range(1, 10)
+        ]
+
     def marks_to_string(self) -> str:
         marks_str = ""
         for r in range(1, 10):
@@ -339,7 +379,8 @@ class SudokuGrid:
         data = self.game_data[self.level]["puzzle"]
         data["original"] = self.values_to_string(Mode.STARTING)
         data["current"] = self.values_to_string(Mode.PLAYING)
-        data["solution"] = self.values_to_string(Mode.SOLVED)
+        if not self.solution_pending:
+            data["solution"] = self.values_to_string(Mode.SOLVED)
         data["marks"] = self.marks_to_string()
 
         file_path = os.path.join(CFG_DIR, self.game_path)
@@ -366,9 +407,33 @@ class SudokuBoard:
         self.prob_toggle = False
         self.curr_row: int = 5
         self.curr_col: int = 5
+        self.solver: BackgroundSolver | None = None
         self.draw_board()
         self.write_puzzle()
         pygame.display.flip()
+        if self.grid.solution_pending:
+            self.start_solver()
+
+    def start_solver(self) -> None:
+        """Solve the puzzle in a worker thread. Progress and the result are
+        posted as SOLVER_PROGRESS_EVENT and SOLVER_DONE_EVENT."""
+        self.solver = BackgroundSolver(
+            self.grid.values_to_list(Mode.STARTING),
+            on_done=self.post_solution,
+            on_progress=self.post_progress,
+        )
+        self.solver.start()
+
+    def post_solution(self, solution: list[int] | None) -> None:
+        pygame.event.post(pygame.event.Event(SOLVER_DONE_EVENT, solution=solution))
+
+    def post_progress(self, nodes: int) -> None:
+        pygame.event.post(pygame.event.Event(SOLVER_PROGRESS_EVENT, nodes=nodes))
+
+    def stop_solver(self) -> None:
+        if self.solver is not None and self.solver.is_alive():
+            self.solver.cancel()
+            self.solver.join()
 
     def clear_cell(self, cell: Cell, mode: Mode) -> None:
         cell.surface.fill(cell.get_background(mode))
@@ -436,14 +501,23 @@ class SudokuBoard:
         self.curr_row = 5
         self.curr_col = 5
 
-    def validate_puzzle(self) -> None:
+    def validate_puzzle(self) -> bool:
         """Check "current" data_map for errors against solution
         and mark the relevant cell's as error"""
-        self.grid.validate()
+        solved = self.grid.validate()
         self.mode = Mode.PLAYING
         self.write_puzzle()
         self.curr_row = 5
         self.curr_col = 5
+        return solved
+
+    def set_value(self, num: int) -> None:
+        """Set the current cell and redraw every cell whose state changed."""
+        for cell in self.grid.set_value(self.curr_row, self.curr_col, num):
+            self.write_cell(cell)
+
+    def update_invalid(self) -> None:
+        self.grid.update_invalid(self.curr_row, self.curr_col)
 
     def valid_move(self, num: int) -> bool:
         return self.grid.is_valid_move(self.curr_row, self.curr_col, num, Mode.PLAYING)
@@ -514,12 +588,50 @@ class GameLoop:
         self.screen = pygame.display.set_mode((WIDTH, WIDTH))
         pygame.display.set_caption("Sudoku")
         self.board = SudokuBoard(self.screen)
+        if self.board.grid.solution_pending:
+            pygame.display.set_caption("Sudoku - solving ...")
+
+    def handle_solver_event(self, event: pygame.event.Event) -> bool:
+        """Handle events posted by the background solver.
+        Returns True if `event` was a solver event."""
+        if event.type == SOLVER_PROGRESS_EVENT:
+            pygame.display.set_caption(f"Sudoku - solving ({event.nodes} nodes)")
+            return True
+        if event.type == SOLVER_DONE_EVENT:
+            if self.board.grid.apply_solution(event.solution):
+                pygame.display.set_caption("Sudoku")
+            else:
+                pygame.display.set_caption("Sudoku - puzzle could not be solved")
+            return True
+        return False
+
+    def solution_pending(self) -> bool:
+        """Show the pending (or failed) state when the solution is not
+        available."""
+        if self.board.grid.solution_failed:
+            pygame.display.set_caption("Sudoku - puzzle could not be solved")
+            return True
+        if self.board.grid.solution_pending:
+            pygame.display.set_caption("Sudoku - solution pending ...")
+            return True
+        return False
+
+    def show_solved(self) -> None:
+        if self.board.grid.is_solved():
+            pygame.display.set_caption("Sudoku - solved !!!!")
+
+    def quit(self) -> None:
+        self.board.stop_solver()
+        pygame.quit()
 
     def run_main_loop(self) -> None:
         run: bool = True
         while run:
             # play game
             for event in pygame.event.get():
+                if self.handle_solver_event(event):
+                    continue
+
                 if event.type == pygame.KEYDOWN:
                     # command mode
                     if event.unicode == ":":
@@ -538,13 +650,13 @@ class GameLoop:
                     # quit game
                     if event.mod & pygame.KMOD_CTRL and event.key == pygame.K_q:
                         run = False
-                        pygame.quit()
+                        self.quit()
                         return
 
                 # close button window
                 if event.type == pygame.QUIT:
                     run = False
-                    pygame.quit()
+                    self.quit()
                     return
 
     def command_mode(self) -> None:
@@ -552,11 +664,17 @@ class GameLoop:
         run: bool = True
         while run:
             for event in pygame.event.get():
+                if self.handle_solver_event(event) or event.type != pygame.KEYDOWN:
+                    continue
+
                 if event.key == pygame.K_q:  # quit game
-                    pygame.quit()
+                    self.quit()
                     sys.exit()
 
                 if event.key == pygame.K_s:
+                    if self.solution_pending():
+                        run = False
+                        break
                     self.board.toggle_mode()
                     self.board.write_puzzle()
                     pygame.display.update()
@@ -593,7 +711,11 @@ class GameLoop:
 
                 # verify current-mode
                 if event.key == pygame.K_v:
-                    self.board.validate_puzzle()
+                    if self.solution_pending():
+                        run = False
+                        break
+                    if self.board.validate_puzzle():
+                        self.show_solved()
                     pygame.display.update()
                     run = False
                     break
@@ -610,6 +732,9 @@ class GameLoop:
             for event in pygame.event.get():
                 pygame.display.update()
 
+                if self.handle_solver_event(event):
+                    continue
+
                 # if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 #     curr_cell = self.mouse_navigation(curr_cell)
                 #     curr_cell.set_focus(Focus.INSERT)
@@ -635,30 +760,27 @@ class GameLoop:
 
                     # update current cell with valid "solved" value
                     if event.unicode == "?":
+                        if self.solution_pending():
+                            continue
                         if curr_cell.is_mutable():
-                            curr_cell.set_to_solved()
-                            self.board.write_cell(curr_cell)
+                            curr_cell.set_error(False)
+                            self.board.set_value(curr_cell.get_val(Mode.SOLVED))
+                            self.show_solved()
                         continue
 
                     # clear current cell
                     if event.key == pygame.K_0:
                         if curr_cell.is_mutable():
-                            curr_cell.set_val(0)
-                            curr_cell.set_invalid(False)
                             curr_cell.set_error(False)
-                            self.board.write_cell(curr_cell)
+                            self.board.set_value(0)
                         continue
 
                     # valid input
                     if event.key in VALID_DIGIT_EVENTS:
                         if curr_cell.is_mutable():
-                            num = event.key - 48
-                            if self.board.valid_move(num):
-                                curr_cell.set_invalid(False)
-                            else:
-                                curr_cell.set_invalid(True)
-                            curr_cell.set_val(num)
-                            self.board.write_cell(curr_cell)
+                            curr_cell.set_error(False)
+                            self.board.set_value(event.key - 48)
+                            self.show_solved()
                         continue
             pygame.display.update()
 
@@ -673,6 +795,9 @@ class GameLoop:
             for event in pygame.event.get():
                 pygame.display.update()
 
+                if self.handle_solver_event(event):
+                    continue
+
                 # if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 #     curr_cell = self.mouse_navigation(curr_cell)
                 #     curr_cell.set_focus(Focus.MARK)
@@ -698,21 +823,16 @@ class GameLoop:
                     if event.key == pygame.K_0:
                         if curr_cell.is_mutable():
                             curr_cell.clear_marks()
-                            curr_cell.set_invalid(False)
                             curr_cell.set_error(False)
+                            self.board.update_invalid()
                             self.board.write_cell(curr_cell)
                         continue
 
                     # add 1..5 mark to this cell
                     if event.key in VALID_DIGIT_EVENTS:
                         if curr_cell.is_mutable():
-                            num = event.key - 48
-                            if self.board.valid_move(num):
-                                curr_cell.set_invalid(False)
-                                curr_cell.add_mark(num)
-                            else:
-                                curr_cell.set_invalid(True)
-                                curr_cell.add_mark(num)
+                            curr_cell.add_mark(event.key - 48)
+                            self.board.update_invalid()
                             self.board.write_cell(curr_cell)
                         continue
             pygame.display.update()
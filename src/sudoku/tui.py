@@ -0,0 +1,297 @@
+"""Terminal (curses) frontend.
+
+Uses the same SudokuGrid model and vim-style modes as the pygame window:
+`i` insert-mode, `m` mark-mode, `:` command-mode and h, j, k, l (or the
+arrow keys) to navigate. Every cell is one character on screen and only
+characters that changed since the last keystroke are written, which keeps
+the traffic per edit down to a few bytes on a remote terminal.
+"""
+from __future__ import annotations
+
+import contextlib
+import curses
+import io
+import os
+import queue
+from typing import Any
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("ESCDELAY", "25")
+
+from .solver import BackgroundSolver  # noqa: E402
+from .sudoku import Cell  # noqa: E402
+from .sudoku import Focus  # noqa: E402
+from .sudoku import Mode  # noqa: E402
+from .sudoku import SudokuGrid  # noqa: E402
+
+FRAME = "+-------+-------+-------+"
+STATUS_ROW = 14
+NAV_KEYS = {
+    ord("h"): (0, -1),
+    ord("j"): (1, 0),
+    ord("k"): (-1, 0),
+    ord("l"): (0, 1),
+    curses.KEY_LEFT: (0, -1),
+    curses.KEY_DOWN: (1, 0),
+    curses.KEY_UP: (-1, 0),
+    curses.KEY_RIGHT: (0, 1),
+}
+ESCAPE = 27
+CTRL_Q = 17
+SOLVED = "solved !!!!"
+
+(
+    PAIR_INVALID,
+    PAIR_ERROR,
+    PAIR_INSERT,
+    PAIR_MARK,
+) = range(1, 5)
+
+
+def screen_pos(row: int, col: int) -> tuple[int, int]:
+    """Screen position of a cell; row and col are sudoku-coordinates."""
+    return row + (row - 1) // 3, 2 * col + 2 * ((col - 1) // 3)
+
+
+class TerminalUI:
+    def __init__(self, stdscr: curses.window, grid: SudokuGrid) -> None:
+        self.stdscr = stdscr
+        self.grid = grid
+        self.mode: Mode = Mode.PLAYING
+        self.focus: Focus = Focus.NONE
+        self.prob_toggle: bool = False
+        self.curr_row: int = 5
+        self.curr_col: int = 5
+        self.status: str = ""
+        self.drawn: dict[tuple[int, int], tuple[str, int]] = {}
+        self.drawn_status: str = ""
+        self.results: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self.solver: BackgroundSolver | None = None
+        self.coords: dict[int, tuple[int, int]] = {
+            id(self.grid.grid[r][c]): (r, c) for r in range(1, 10) for c in range(1, 10)
+        }
+
+        curses.curs_set(0)
+        curses.use_default_colors()
+        curses.init_pair(PAIR_INVALID, curses.COLOR_RED, -1)
+        curses.init_pair(PAIR_ERROR, curses.COLOR_WHITE, curses.COLOR_RED)
+        curses.init_pair(PAIR_INSERT, curses.COLOR_BLACK, curses.COLOR_YELLOW)
+        curses.init_pair(PAIR_MARK, curses.COLOR_BLACK, curses.COLOR_CYAN)
+        self.draw_frame()
+        self.write_puzzle()
+
+        if self.grid.solution_pending:
+            self.status = "solving ..."
+            self.solver = BackgroundSolver(
+                self.grid.values_to_list(Mode.STARTING),
+                on_done=lambda solution: self.results.put(("done", solution)),
+                on_progress=lambda nodes: self.results.put(("progress", nodes)),
+            )
+            self.solver.start()
+            # poll the solver results between keystrokes
+            self.stdscr.timeout(100)
+
+    def draw_frame(self) -> None:
+        """Draw the static grid lines once."""
+        self.stdscr.erase()
+        for line in range(13):
+            if line % 4 == 0:
+                self.stdscr.addstr(line, 0, FRAME)
+            else:
+                self.stdscr.addstr(line, 0, "|       |       |       |")
+
+    def cell_look(self, cell: Cell) -> tuple[str, int]:
+        value = cell.get_val(self.mode)
+        char = str(value) if value != 0 else "."
+        attr = curses.A_NORMAL if cell.is_mutable() else curses.A_BOLD
+        if self.mode == Mode.PLAYING:
+            if cell.error:
+                attr |= curses.color_pair(PAIR_ERROR)
+            elif cell.invalid:
+                attr |= curses.color_pair(PAIR_INVALID)
+            if value == 0 and cell.marks:
+                char = "*"
+        if cell.focus == Focus.INSERT:
+            attr |= curses.color_pair(PAIR_INSERT)
+        elif cell.focus == Focus.MARK:
+            attr |= curses.color_pair(PAIR_MARK)
+        return char, attr
+
+    def write_cell(self, cell: Cell) -> None:
+        """Write the cell if its character or attributes changed."""
+        row, col = self.coords[id(cell)]
+        look = self.cell_look(cell)
+        if self.drawn.get((row, col)) != look:
+            self.stdscr.addstr(*screen_pos(row, col), *look)
+            self.drawn[(row, col)] = look
+
+    def write_puzzle(self) -> None:
+        for row in range(1, 10):
+            for col in range(1, 10):
+                self.write_cell(self.grid.grid[row][col])
+
+    def write_status(self) -> None:
+        cell = self.get_curr_cell()
+        mode = {Focus.NONE: "", Focus.INSERT: "-- INSERT --", Focus.MARK: "-- MARK --"}
+        parts = [mode[self.focus], self.status]
+        if cell.marks:
+            parts.append("marks " + "".join(str(m) for m in cell.marks))
+        if self.prob_toggle and cell.get_val() == 0:
+            options = self.grid.find_options(self.curr_row, self.curr_col)
+            parts.append("options " + "".join(str(o) for o in sorted(options)))
+        status = "  ".join(p for p in parts if p)
+        if status != self.drawn_status:
+            self.stdscr.move(STATUS_ROW, 0)
+            self.stdscr.clrtoeol()
+            self.stdscr.addstr(STATUS_ROW, 0, status)
+            self.drawn_status = status
+
+    def get_curr_cell(self) -> Cell:
+        return self.grid.grid[self.curr_row][self.curr_col]
+
+    def set_value(self, num: int) -> None:
+        for cell in self.grid.set_value(self.curr_row, self.curr_col, num):
+            self.write_cell(cell)
+        self.show_solved()
+
+    def show_solved(self) -> None:
+        """Follow the grid: an edit can also undo a solved puzzle."""
+        if self.grid.is_solved():
+            self.status = SOLVED
+        elif self.status == SOLVED:
+            self.status = ""
+
+    def solution_pending(self) -> bool:
+        if self.grid.solution_failed:
+            self.status = "puzzle could not be solved"
+            return True
+        if self.grid.solution_pending:
+            self.status = "solution pending ..."
+            return True
+        return False
+
+    def handle_solver_results(self) -> None:
+        while not self.results.empty():
+            kind, result = self.results.get()
+            if kind == "progress":
+                self.status = f"solving ({result} nodes)"
+            else:
+                # keep the grid's console output off the curses screen
+                with contextlib.redirect_stdout(io.StringIO()):
+                    solved = self.grid.apply_solution(result)
+                self.status = "" if solved else "puzzle could not be solved"
+                self.stdscr.timeout(-1)
+
+    def navigate(self, key: int) -> None:
+        cell = self.get_curr_cell()
+        cell.set_focus(Focus.NONE)
+        self.write_cell(cell)
+        d_row, d_col = NAV_KEYS[key]
+        self.curr_row = min(max(self.curr_row + d_row, 1), 9)
+        self.curr_col = min(max(self.curr_col + d_col, 1), 9)
+        cell = self.get_curr_cell()
+        cell.set_focus(self.focus)
+        self.write_cell(cell)
+
+    def set_focus(self, focus: Focus) -> None:
+        self.focus = focus
+        cell = self.get_curr_cell()
+        cell.set_focus(focus)
+        self.write_cell(cell)
+
+    def command(self, key: int) -> bool:
+        """Handle the key after ':'. Returns False to quit."""
+        if key == ord("q"):
+            return False
+        if key == ord("s"):
+            if not self.solution_pending():
+                self.mode = Mode.PLAYING if self.mode == Mode.SOLVED else Mode.SOLVED
+        elif key in (ord("p"), ord("c")):
+            self.prob_toggle = key == ord("p")
+        elif key == ord("r"):
+            self.grid.reset_to_start()
+            self.mode = Mode.PLAYING
+            self.curr_row = 5
+            self.curr_col = 5
+            self.show_solved()
+        elif key == ord("w"):
+            self.grid.write_game_status()
+            self.status = "written"
+        elif key == ord("v"):
+            if not self.solution_pending():
+                self.mode = Mode.PLAYING
+                self.grid.validate()
+                self.show_solved()
+        self.write_puzzle()
+        return True
+
+    def edit(self, key: int) -> None:
+        """Handle a key in insert-mode or mark-mode."""
+        cell = self.get_curr_cell()
+        if not cell.is_mutable():
+            return
+        if self.focus == Focus.INSERT:
+            if key == ord("?"):
+                if not self.solution_pending():
+                    cell.set_error(False)
+                    self.set_value(cell.get_val(Mode.SOLVED))
+            elif key == ord("0"):
+                cell.set_error(False)
+                self.set_value(0)
+            elif ord("1") <= key <= ord("9"):
+                cell.set_error(False)
+                self.set_value(key - ord("0"))
+        else:
+            if key == ord("0"):
+                cell.clear_marks()
+                cell.set_error(False)
+            elif ord("1") <= key <= ord("9"):
+                cell.add_mark(key - ord("0"))
+            self.grid.update_invalid(self.curr_row, self.curr_col)
+            self.write_cell(cell)
+
+    def run(self) -> None:
+        command_mode = False
+        while True:
+            self.write_status()
+            self.stdscr.refresh()
+            key = self.stdscr.getch()
+            self.handle_solver_results()
+            if key == -1:
+                continue
+            if command_mode:
+                command_mode = False
+                if not self.command(key):
+                    break
+            elif key == CTRL_Q:
+                break
+            elif self.focus == Focus.NONE:
+                if key == ord(":"):
+                    command_mode = True
+                elif key == ord("i"):
+                    self.set_focus(Focus.INSERT)
+                elif key == ord("m"):
+                    self.set_focus(Focus.MARK)
+            elif key == ESCAPE:
+                self.set_focus(Focus.NONE)
+            elif key in NAV_KEYS:
+                self.navigate(key)
+            else:
+                self.edit(key)
+        if self.solver is not None and self.solver.is_alive():
+            self.solver.cancel()
+            self.solver.join()
+
+
+def run(stdscr: curses.window, grid: SudokuGrid) -> None:
+    TerminalUI(stdscr, grid).run()
+
+
+def main() -> None:
+    # load the game before curses takes over the terminal
+    grid = SudokuGrid()
+    curses.wrapper(run, grid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Static index tables for the cells, units and peers of the grid.
+
+Cells are numbered 0..80 in row-major order. Units 0..8 are the rows,
+9..17 the columns and 18..26 the 3x3 boxes.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+
+def box_index(index: int) -> int:
+    return (index // 27) * 3 + (index % 9) // 3
+
+
+def cell_index(row: int, col: int) -> int:
+    """Row and Col are sudoku-coordinates (1..9)."""
+    return (row - 1) * 9 + (col - 1)
+
+
+UNITS: tuple[tuple[int, ...], ...] = (
+    tuple(tuple(r * 9 + c for c in range(9)) for r in range(9))
+    + tuple(tuple(r * 9 + c for r in range(9)) for c in range(9))
+    + tuple(tuple(i for i in range(81) if box_index(i) == b) for b in range(9))
+)
+CELL_UNITS: tuple[tuple[int, int, int], ...] = tuple(
+    (i // 9, 9 + i % 9, 18 + box_index(i)) for i in range(81)
+)
+PEERS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(sorted({p for u in CELL_UNITS[i] for p in UNITS[u]} - {i}))
+    for i in range(81)
+)
+
+
+class ConflictTracker:
+    """Keep per-unit digit counts up to date while the grid is edited.
+
+    A cell is in conflict when its digit occurs more than once in one of
+    its units. `set_value` updates the counts and re-checks only the edited
+    cell and its peers, so every edit costs O(20) whatever the grid holds."""
+
+    def __init__(self, values: Sequence[int] | None = None) -> None:
+        self.values: list[int] = [0] * 81
+        self.counts: list[list[int]] = [[0] * 10 for _ in range(27)]
+        self.conflicts: set[int] = set()
+        self.filled: int = 0
+        if values is not None:
+            for index, num in enumerate(values):
+                self.set_value(index, num)
+
+    def is_conflicting(self, index: int) -> bool:
+        num = self.values[index]
+        return num != 0 and any(self.counts[u][num] > 1 for u in CELL_UNITS[index])
+
+    def allows(self, index: int, num: int) -> bool:
+        """True if no peer of the cell holds `num`."""
+        own = 1 if self.values[index] == num else 0
+        return all(self.counts[u][num] - own == 0 for u in CELL_UNITS[index])
+
+    def set_value(self, index: int, num: int) -> set[int]:
+        """Set a cell and return the cells whose conflict status changed."""
+        old = self.values[index]
+        if old == num:
+            return set()
+        if old != 0:
+            self.filled -= 1
+            for u in CELL_UNITS[index]:
+                self.counts[u][old] -= 1
+        if num != 0:
+            self.filled += 1
+            for u in CELL_UNITS[index]:
+                self.counts[u][num] += 1
+        self.values[index] = num
+
+        changed = set()
+        for cell in (index, *PEERS[index]):
+            if cell != index and self.values[cell] not in (old, num):
+                continue
+            status = self.is_conflicting(cell)
+            if status != (cell in self.conflicts):
+                if status:
+                    self.conflicts.add(cell)
+                else:
+                    self.conflicts.discard(cell)
+                changed.add(cell)
+        return changed
+
+    def is_solved(self) -> bool:
+        return self.filled == 81 and not self.conflicts
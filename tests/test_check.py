@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+
+from sudoku.check import FORMAT_VERSION
+from sudoku.check import check_archive
+from sudoku.check import check_level
+from tests import PUZZLE
+from tests import SOLUTION
+
+MARKS = "/".join(["||||||||"] * 9)
+
+
+def test_clean_level() -> None:
+    data = {"original": PUZZLE, "current": PUZZLE, "solution": SOLUTION, "marks": MARKS}
+    assert check_level(data, fix=False, migrate=False) == []
+
+
+def test_problems_are_reported() -> None:
+    data = {
+        "original": PUZZLE,
+        "current": "6" + PUZZLE[1:],  # overwrites a given
+        "solution": "530678912" + SOLUTION[9:],  # incomplete
+        "marks": "12345" + MARKS,
+    }
+    issues = {i["check"]: i for i in check_level(data, fix=True, migrate=False)}
+    assert issues["current"]["cells"] == [0]
+    assert issues["solution"]["cells"] == [2]
+    assert issues["marks"]["cells"] == [0]
+    assert data["marks"] == "1234" + MARKS
+
+
+def test_archive_migration(tmp_path) -> None:
+    file_path = os.path.join(tmp_path, "nytimes-20260101-sudoku.json")
+    game_data = {"date": "20260101", "hard": {"puzzle": {"original": PUZZLE}}}
+    with open(file_path, "w") as f:
+        f.write(json.dumps(game_data))
+
+    report = check_archive(str(tmp_path), migrate=True, workers=1)
+    assert report["files"] == 1
+    assert report["files_with_problems"] == 0
+    assert report["files_written"] == 1
+    with open(file_path) as f:
+        game_data = json.loads(f.read())
+    assert game_data["version"] == FORMAT_VERSION
+    assert game_data["hard"]["puzzle"]["solution"] == SOLUTION
+
+
+def test_malformed_files_are_reported(tmp_path) -> None:
+    # well-formed, but the current game overwrites a given
+    good = {"original": PUZZLE, "current": "6" + PUZZLE[1:]}
+    files = {
+        "20260101": {"hard": {"puzzle": good}},
+        "20260102": {"easy": {"puzzle_id": 1}, "hard": {"puzzle": {"original": None}}},
+        "20260103": {"hard": {"puzzle": {"original": PUZZLE, "marks": None}}},
+        "20260104": [PUZZLE],
+    }
+    for date, game_data in files.items():
+        file_path = os.path.join(tmp_path, f"nytimes-{date}-sudoku.json")
+        with open(file_path, "w") as f:
+            f.write(json.dumps(game_data))
+
+    report = check_archive(str(tmp_path), workers=1)
+    assert report["files"] == 4
+    problems = {p["file"][8:16]: p for p in report["problems"]}
+    assert problems["20260101"]["levels"]["hard"] == [
+        {"check": "current", "cells": [0]},
+    ]
+    assert problems["20260102"]["levels"]["easy"][0]["check"] == "puzzle"
+    assert problems["20260102"]["levels"]["hard"][0]["check"] == "original"
+    assert problems["20260103"]["levels"]["hard"][0]["check"] == "marks"
+    assert "error" in problems["20260104"]
+
+
+def test_only_changed_or_migratable_files_are_written(tmp_path) -> None:
+    # --fix can't repair a current game that overwrites a given
+    unfixable = {"original": PUZZLE, "current": "6" + PUZZLE[1:]}
+    files = {
+        "20260101": {"hard": {"puzzle": unfixable}},
+        # conflicting givens can't get a verified solution
+        "20260102": {
+            "easy": {"puzzle": {"original": PUZZLE}},
+            "hard": {"puzzle": {"original": "55" + PUZZLE[2:]}},
+        },
+    }
+    for date, game_data in files.items():
+        file_path = os.path.join(tmp_path, f"nytimes-{date}-sudoku.json")
+        with open(file_path, "w") as f:
+            f.write(json.dumps(game_data))
+
+    report = check_archive(str(tmp_path), fix=True, workers=1)
+    assert report["files_written"] == 0
+
+    report = check_archive(str(tmp_path), migrate=True, workers=1)
+    assert report["files_written"] == 1
+    problems = {p["file"][8:16]: p for p in report["problems"]}
+    assert "not_migrated" not in problems["20260101"]
+    assert problems["20260102"]["not_migrated"] == ["hard"]
+    with open(os.path.join(tmp_path, "nytimes-20260102-sudoku.json")) as f:
+        assert "version" not in json.loads(f.read())
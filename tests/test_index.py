@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+
+from sudoku.index import HIDDEN_SINGLES
+from sudoku.index import NAKED_SINGLES
+from sudoku.index import SEARCH
+from sudoku.index import connect
+from sudoku.index import query
+from sudoku.index import rate
+from sudoku.index import symmetries
+from sudoku.index import update_index
+from sudoku.solver import parse_puzzle
+from tests import PUZZLE
+
+# 17 clues, needs hidden singles
+HIDDEN = (
+    "000000010/400000000/020000000/000050407/008000300/"
+    "001090000/300400200/050100000/000806000"
+)
+
+
+def write_day(directory: str, date: str, puzzle: str) -> None:
+    game_data = {
+        "date": date,
+        "hard": {"puzzle_id": 1, "puzzle": {"original": puzzle}},
+    }
+    file_path = os.path.join(directory, f"nytimes-{date}-sudoku.json")
+    with open(file_path, "w") as f:
+        f.write(json.dumps(game_data))
+
+
+def test_rate() -> None:
+    assert rate(parse_puzzle(PUZZLE)) == NAKED_SINGLES
+    assert rate(parse_puzzle(HIDDEN)) == HIDDEN_SINGLES
+    assert rate([0] * 81) == SEARCH
+
+
+def test_symmetries() -> None:
+    assert "rotational" in symmetries("0" * 81)
+    pattern = "1" + "0" * 80
+    assert symmetries(pattern) == ["diagonal"]
+
+
+def test_incremental_update_and_query(tmp_path) -> None:
+    write_day(str(tmp_path), "20260101", PUZZLE)
+    db = connect(str(tmp_path))
+    assert update_index(db, str(tmp_path)) == 1
+    assert update_index(db, str(tmp_path)) == 0
+
+    write_day(str(tmp_path), "20260102", HIDDEN)
+    assert update_index(db, str(tmp_path)) == 1
+
+    rows = query(db, level="hard", max_clues=24)
+    assert [row["date"] for row in rows] == ["20260102"]
+    assert query(db, min_clues=30)[0]["date"] == "20260101"
+    pattern = "11..1...." + "." * 72
+    assert [row["date"] for row in query(db, pattern=pattern)] == ["20260101"]
+
+
+def test_removed_levels_and_files_are_dropped(tmp_path) -> None:
+    write_day(str(tmp_path), "20260101", PUZZLE)
+    write_day(str(tmp_path), "20260102", HIDDEN)
+    file_path = os.path.join(tmp_path, "nytimes-20260101-sudoku.json")
+    with open(file_path) as f:
+        game_data = json.loads(f.read())
+    game_data["easy"] = game_data["hard"]
+    with open(file_path, "w") as f:
+        f.write(json.dumps(game_data))
+    db = connect(str(tmp_path))
+    assert update_index(db, str(tmp_path)) == 2
+    assert len(query(db, level="easy")) == 1
+
+    del game_data["easy"]
+    with open(file_path, "w") as f:
+        f.write(json.dumps(game_data))
+    os.utime(file_path, (0, 0))
+    os.remove(os.path.join(tmp_path, "nytimes-20260102-sudoku.json"))
+    assert update_index(db, str(tmp_path)) == 1
+    assert [(row["date"], row["level"]) for row in query(db)] == [("20260101", "hard")]
+    assert [row["name"] for row in db.execute("SELECT name FROM files")] == [
+        "nytimes-20260101-sudoku.json",
+    ]
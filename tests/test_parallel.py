@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from sudoku.parallel import parallel_count
+from sudoku.parallel import parallel_solve
+from sudoku.parallel import split_subproblems
+from sudoku.solver import count_solutions
+from sudoku.solver import format_puzzle
+from sudoku.solver import parse_puzzle
+from tests import PUZZLE
+from tests import SOLUTION
+
+
+def test_split_covers_all_solutions() -> None:
+    values = parse_puzzle(PUZZLE)
+    for index in [i for i, num in enumerate(values) if num][:6]:
+        values[index] = 0  # 64 solutions
+    subproblems = split_subproblems(values, 8)
+    assert len(subproblems) >= 8
+    assert sum(count_solutions(sub) for sub in subproblems) == count_solutions(values)
+
+
+def test_parallel_solve() -> None:
+    solution = parallel_solve(parse_puzzle(PUZZLE), workers=2)
+    assert solution is not None
+    assert format_puzzle(solution) == SOLUTION
+
+
+def test_parallel_count() -> None:
+    assert parallel_count(parse_puzzle(PUZZLE), workers=2) == 1
+    assert parallel_count([0] * 81, limit=10, workers=2) == 10
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+
+from sudoku.render import MARGIN
+from sudoku.render import SOLUTION_COLOR
+from sudoku.render import TITLE
+from sudoku.render import PageRenderer
+from sudoku.render import PuzzleSpec
+from sudoku.render import load_puzzles
+from sudoku.render import render_pages
+from tests import PUZZLE
+from tests import SOLUTION
+
+MARKS = "/".join(["||||||||"] * 9)
+
+
+def cell_colors(surface, index: int, cell: int) -> set[tuple[int, int, int]]:
+    x, y = (index % 9) * cell, (index // 9) * cell
+    return {
+        tuple(surface.get_at((x + dx, y + dy)))[:3]
+        for dx in range(2, cell - 1)
+        for dy in range(2, cell - 1)
+    }
+
+
+def test_surface_sizes() -> None:
+    renderer = PageRenderer(cell=20)
+    assert renderer.render_puzzle(PuzzleSpec("t", PUZZLE)).get_size() == (181, 181)
+    page = renderer.render_page([PuzzleSpec("t", PUZZLE)], columns=2, rows=3)
+    assert page.get_size() == (
+        2 * 181 + 3 * MARGIN,
+        3 * (181 + TITLE) + 4 * MARGIN,
+    )
+
+
+def test_solution_and_saved_game_combined() -> None:
+    renderer = PageRenderer(cell=40)
+    current = "534" + PUZZLE[3:]  # cell 2 filled by the player
+    surface = renderer.render_puzzle(
+        PuzzleSpec("t", PUZZLE, current=current, solution=SOLUTION, marks=MARKS),
+    )
+    assert SOLUTION_COLOR not in cell_colors(surface, 2, 40)
+    assert SOLUTION_COLOR in cell_colors(surface, 3, 40)
+
+
+def test_load_puzzles_solves_missing_solution(tmp_path) -> None:
+    file_path = os.path.join(tmp_path, "nytimes-20260101-sudoku.json")
+    game_data = {"date": "20260101", "hard": {"puzzle": {"original": PUZZLE}}}
+    with open(file_path, "w") as f:
+        f.write(json.dumps(game_data))
+
+    (puzzle,) = load_puzzles([file_path], ["easy", "hard"], True, False)
+    assert puzzle.title == "20260101 hard"
+    assert puzzle.solution == SOLUTION
+    assert puzzle.current is None
+
+
+def test_render_pages_splits_puzzles(tmp_path) -> None:
+    puzzles = [PuzzleSpec(f"p{i}", PUZZLE) for i in range(13)]
+    paths = render_pages(puzzles, str(tmp_path), columns=2, rows=3, workers=2)
+    assert [os.path.basename(p) for p in paths] == [
+        "sudoku-page-0001.png",
+        "sudoku-page-0002.png",
+        "sudoku-page-0003.png",
+    ]
+    assert all(os.path.getsize(p) > 0 for p in paths)
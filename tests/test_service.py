@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from sudoku.service import SolverService
+from sudoku.service import solve_batch
+from tests import PUZZLE
+from tests import SOLUTION
+
+EMPTY = "/".join(["000000000"] * 9)
+
+
+def test_solve_batch() -> None:
+    unique, ambiguous, bad = solve_batch([PUZZLE, EMPTY, "12/34"])
+    assert unique["solution"] == SOLUTION
+    assert unique["solutions"] == 1
+    assert unique["nodes"] > 0
+    assert ambiguous["solutions"] == 2
+    assert "error" in bad
+
+
+def test_node_budget() -> None:
+    (result,) = solve_batch([PUZZLE], budget=5)
+    assert result["error"] == "node budget exceeded"
+    assert result["nodes"] == 5
+
+    # an empty grid is solved in 81 nodes, the budget runs out while counting
+    (result,) = solve_batch([EMPTY], budget=81)
+    assert result["solution"] is not None
+    assert result["solutions"] == 1
+    assert result["budget_exceeded"]
+
+
+def test_service_answers_in_order(tmp_path) -> None:
+    socket_path = str(tmp_path / "solver.sock")
+
+    async def run() -> list[dict]:
+        service = SolverService(workers=1)
+        await service.start()
+        server = await asyncio.start_unix_server(service.handle_client, socket_path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(f"{PUZZLE}\n{EMPTY}\n".encode())
+            writer.write_eof()
+            lines = [json.loads(line) async for line in reader]
+            writer.close()
+            return lines
+        finally:
+            server.close()
+            service.close()
+
+    first, second = asyncio.run(run())
+    assert first["solution"] == SOLUTION
+    assert second["puzzle"] == EMPTY
+
+
+def test_service_answers_bad_input(tmp_path) -> None:
+    socket_path = str(tmp_path / "solver.sock")
+
+    async def run() -> list[dict]:
+        service = SolverService(workers=1)
+        await service.start()
+        server = await asyncio.start_unix_server(service.handle_client, socket_path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            # invalid utf-8, then a line over the 64 KiB stream limit
+            writer.write(f"{PUZZLE}\n".encode() + b"\xff\xfe\n" + b"0" * 70000)
+            writer.write_eof()
+            lines = [json.loads(line) async for line in reader]
+            writer.close()
+            return lines
+        finally:
+            server.close()
+            service.close()
+
+    solved, bad_utf8, too_long = asyncio.run(run())
+    assert solved["solution"] == SOLUTION
+    assert "error" in bad_utf8
+    assert "error" in too_long
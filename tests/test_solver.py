@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+from sudoku.solver import BackgroundSolver
+from sudoku.solver import SolutionIterator
+from sudoku.solver import count_solutions
+from sudoku.solver import format_puzzle
+from sudoku.solver import parse_puzzle
+from sudoku.solver import solve
+from tests import PUZZLE
+from tests import SOLUTION
+
+
+def test_parse_and_format_roundtrip() -> None:
+    values = parse_puzzle(PUZZLE)
+    assert len(values) == 81
+    assert format_puzzle(values) == PUZZLE
+
+
+def test_parse_rejects_bad_input() -> None:
+    with pytest.raises(ValueError):
+        parse_puzzle("123/456")
+
+
+def test_solve() -> None:
+    solution = solve(parse_puzzle(PUZZLE))
+    assert solution is not None
+    assert format_puzzle(solution) == SOLUTION
+
+
+def test_unique_solution_count() -> None:
+    assert count_solutions(parse_puzzle(PUZZLE)) == 1
+
+
+def test_conflicting_givens_have_no_solution() -> None:
+    values = parse_puzzle(PUZZLE)
+    values[1] = 5  # second 5 in the first row
+    assert solve(values) is None
+
+
+def test_iterator_streams_multiple_solutions() -> None:
+    values = [0] * 81
+    it = SolutionIterator(values)
+    first = next(it)
+    second = next(it)
+    assert first != second
+    assert count_solutions(values, limit=5) == 5
+
+
+def test_budget_pauses_and_resumes() -> None:
+    it = SolutionIterator(parse_puzzle(PUZZLE))
+    pauses = 0
+    while (solution := it.next_solution(budget=1)) is None:
+        assert not it.exhausted
+        pauses += 1
+    assert pauses > 0
+    assert format_puzzle(solution) == SOLUTION
+    assert it.next_solution() is None
+    assert it.exhausted
+
+
+def test_budget_must_allow_progress() -> None:
+    it = SolutionIterator(parse_puzzle(PUZZLE))
+    with pytest.raises(ValueError):
+        it.next_solution(budget=0)
+    with pytest.raises(ValueError):
+        BackgroundSolver(parse_puzzle(PUZZLE), on_done=print, step=0)
+
+
+def test_full_grid_yields_itself_once() -> None:
+    values = parse_puzzle(SOLUTION)
+    assert list(SolutionIterator(values)) == [values]
+
+
+def test_background_solver_reports_solution() -> None:
+    results: list[list[int] | None] = []
+    worker = BackgroundSolver(parse_puzzle(PUZZLE), on_done=results.append, step=1)
+    worker.start()
+    worker.join(timeout=10)
+    assert len(results) == 1
+    assert results[0] is not None
+    assert format_puzzle(results[0]) == SOLUTION
+
+
+def test_background_solver_cancel() -> None:
+    results: list[list[int] | None] = []
+    worker = BackgroundSolver(parse_puzzle(PUZZLE), on_done=results.append)
+    worker.cancel()
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+    assert results == []
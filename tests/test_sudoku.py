@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from sudoku import sudoku
+from sudoku.solver import parse_puzzle
+from sudoku.sudoku import SudokuGrid
+from tests import PUZZLE
+from tests import SOLUTION
+
+
+@pytest.fixture
+def grid(tmp_path, monkeypatch) -> SudokuGrid:
+    game_data = {
+        "date": "20260101",
+        "hard": {"puzzle": {"original": PUZZLE, "solution": SOLUTION}},
+    }
+    with open(os.path.join(tmp_path, "nytimes-20260101-sudoku.json"), "w") as f:
+        f.write(json.dumps(game_data))
+    monkeypatch.setattr(sudoku, "CFG_DIR", str(tmp_path))
+    monkeypatch.setattr(sys, "argv", ["sudoku", "20260101", "-l", "hard"])
+    return SudokuGrid()
+
+
+def test_validate_clears_errors_once_solved(grid) -> None:
+    cell = grid.get_cell(1, 3)
+    grid.set_value(1, 3, 1)  # the solution is 4
+    assert not grid.validate()
+    assert cell.error
+
+    for index, num in enumerate(parse_puzzle(SOLUTION)):
+        grid.set_value(index // 9 + 1, index % 9 + 1, num)
+    assert grid.validate()
+    assert not cell.error
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import curses
+import json
+import os
+import sys
+
+import pytest
+
+from sudoku import sudoku
+from sudoku.solver import parse_puzzle
+from sudoku.sudoku import Focus
+from sudoku.sudoku import SudokuGrid
+from sudoku.tui import SOLVED
+from sudoku.tui import TerminalUI
+from sudoku.tui import screen_pos
+from tests import PUZZLE
+from tests import SOLUTION
+
+
+class StubWindow:
+    """Records the cells written to the screen."""
+
+    def __init__(self) -> None:
+        self.written: list[tuple[int, int]] = []
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        if len(text) == 1:
+            self.written.append((y, x))
+
+    def __getattr__(self, name: str):
+        return lambda *args: None
+
+
+@pytest.fixture
+def ui(tmp_path, monkeypatch) -> TerminalUI:
+    game_data = {
+        "date": "20260101",
+        "hard": {"puzzle": {"original": PUZZLE, "solution": SOLUTION}},
+    }
+    with open(os.path.join(tmp_path, "nytimes-20260101-sudoku.json"), "w") as f:
+        f.write(json.dumps(game_data))
+    monkeypatch.setattr(sudoku, "CFG_DIR", str(tmp_path))
+    monkeypatch.setattr(sys, "argv", ["sudoku", "20260101", "-l", "hard"])
+    for name in ("curs_set", "use_default_colors", "init_pair"):
+        monkeypatch.setattr(curses, name, lambda *args: None)
+    monkeypatch.setattr(curses, "color_pair", lambda pair: 1 << (8 + pair))
+    ui = TerminalUI(StubWindow(), SudokuGrid())
+    ui.set_focus(Focus.INSERT)
+    ui.stdscr.written.clear()
+    return ui
+
+
+def test_edit_writes_changed_cells_only(ui) -> None:
+    ui.edit(ord("4"))  # row 5 has a given 4 in column 1
+    assert sorted(ui.stdscr.written) == [screen_pos(5, 1), screen_pos(5, 5)]
+
+    ui.stdscr.written.clear()
+    ui.write_puzzle()
+    assert ui.stdscr.written == []
+
+    ui.edit(ord("0"))
+    assert sorted(ui.stdscr.written) == [screen_pos(5, 1), screen_pos(5, 5)]
+
+
+def test_mark_edit_writes_the_cell(ui) -> None:
+    ui.set_focus(Focus.MARK)
+    ui.stdscr.written.clear()
+    ui.edit(ord("4"))
+    assert ui.stdscr.written == [screen_pos(5, 5)]
+    ui.stdscr.written.clear()
+    ui.edit(ord("6"))  # still shown as a marked cell
+    assert ui.stdscr.written == []
+
+
+def test_validate_command_writes_errors_only(ui) -> None:
+    ui.edit(ord("4"))
+    ui.stdscr.written.clear()
+    assert ui.command(ord("v"))
+    assert ui.stdscr.written == [screen_pos(5, 5)]
+    assert ui.get_curr_cell().error
+
+
+def test_solved_status_follows_the_grid(ui) -> None:
+    for index, num in enumerate(parse_puzzle(SOLUTION)):
+        ui.curr_row, ui.curr_col = index // 9 + 1, index % 9 + 1
+        ui.edit(ord(str(num)))
+    assert ui.status == SOLVED
+    ui.curr_row, ui.curr_col = 5, 5
+    ui.edit(ord("0"))
+    assert ui.status == ""
+
+    ui.edit(ord("5"))
+    assert ui.status == SOLVED
+    ui.command(ord("v"))
+    assert ui.status == SOLVED
+    ui.command(ord("r"))
+    assert ui.status == ""
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from sudoku.solver import parse_puzzle
+from sudoku.units import PEERS
+from sudoku.units import UNITS
+from sudoku.units import ConflictTracker
+from sudoku.units import cell_index
+from tests import SOLUTION
+
+
+def test_tables() -> None:
+    assert len(UNITS) == 27
+    assert all(len(unit) == 9 for unit in UNITS)
+    assert all(len(peers) == 20 for peers in PEERS)
+    assert cell_index(1, 1) == 0
+    assert cell_index(9, 9) == 80
+
+
+def test_conflicts_are_flagged_and_unflagged() -> None:
+    tracker = ConflictTracker()
+    tracker.set_value(cell_index(1, 1), 5)
+    changed = tracker.set_value(cell_index(1, 9), 5)
+    assert changed == {cell_index(1, 1), cell_index(1, 9)}
+    assert tracker.conflicts == changed
+    assert not tracker.allows(cell_index(1, 5), 5)
+
+    changed = tracker.set_value(cell_index(1, 9), 0)
+    assert changed == {cell_index(1, 1), cell_index(1, 9)}
+    assert tracker.conflicts == set()
+    assert tracker.allows(cell_index(1, 1), 5)
+
+
+def test_solved_without_scan() -> None:
+    values = parse_puzzle(SOLUTION)
+    tracker = ConflictTracker(values)
+    assert tracker.is_solved()
+
+    tracker.set_value(0, 0)
+    assert not tracker.is_solved()
+    tracker.set_value(0, 3)
+    assert not tracker.is_solved()
+    assert 0 in tracker.conflicts
+    tracker.set_value(0, values[0])
+    assert tracker.is_solved()